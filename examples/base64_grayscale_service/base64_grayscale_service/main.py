@@ -4,7 +4,7 @@ from fastapi import FastAPI
 
 from stateless_microservice import ServiceConfig, create_app
 
-from .processor import GrayscaleProcessor
+from .processor import GrayscaleProcessor, image_pool_lifespan
 
 
 processor = GrayscaleProcessor()
@@ -15,5 +15,6 @@ app: FastAPI = create_app(
         name="base64-grayscale-service",
         description="Minimal example that converts a base64 image into grayscale.",
         version="0.1.0",
+        lifespan=image_pool_lifespan,
     ),
 )
@@ -1,10 +1,17 @@
 """Simple processor that converts a base64 image payload to grayscale."""
 
-import base64
+import asyncio
+import contextlib
+import hashlib
 import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 
-from pydantic import BaseModel, Field
+import pybase64
+from cachetools import LRUCache
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, Field
 from PIL import Image, ImageOps
 
 from stateless_microservice import BaseProcessor, StatelessAction, run_blocking
@@ -13,22 +20,63 @@ from stateless_microservice import BaseProcessor, StatelessAction, run_blocking
 class GrayscaleRequest(BaseModel):
     """Incoming payload that carries a base64 encoded image."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     image_b64: str = Field(..., description="Base64 encoded image bytes.")
 
 
 class GrayscaleResponse(BaseModel):
     """Response payload with the grayscale image encoded as base64 PNG."""
 
+    model_config = ConfigDict(frozen=True)
+
     grayscale_b64: str = Field(..., description="Base64 encoded grayscale PNG bytes.")
 
 
+# Decode/convert/encode is CPU-bound, so run it in worker processes (one per CPU)
+# rather than threads that would contend for the GIL. Set up by image_pool_lifespan.
+_IMAGE_POOL: ProcessPoolExecutor | None = None
+
+
+@contextlib.asynccontextmanager
+async def image_pool_lifespan(app):
+    """Own the image worker pool for the lifetime of the app."""
+    global _IMAGE_POOL
+    # forkserver: by the time the pool starts workers the server is multi-threaded,
+    # and forking a threaded process can deadlock
+    _IMAGE_POOL = ProcessPoolExecutor(mp_context=multiprocessing.get_context("forkserver"))
+    try:
+        yield
+    finally:
+        pool, _IMAGE_POOL = _IMAGE_POOL, None
+        # Waiting for the workers to exit would otherwise block the event loop
+        await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+
+
+# Conversions are deterministic, so results are cached by input digest. Entries are
+# weighed by their encoded length, bounding the cache to ~64 MiB of base64 output.
+# Only touched from the event loop, so no locking is needed.
+_GRAYSCALE_CACHE: LRUCache[bytes, str] = LRUCache(maxsize=64 * 1024 * 1024, getsizeof=len)
+
+
 def _convert_to_grayscale(image_bytes: bytes) -> str:
     """Return base64-encoded PNG data for the grayscale version of the image."""
     with Image.open(io.BytesIO(image_bytes)) as img:
         grayscale = ImageOps.grayscale(img)
         buffer = io.BytesIO()
         grayscale.save(buffer, format="PNG")
-    return base64.b64encode(buffer.getvalue()).decode("ascii")
+    # Encode straight from the buffer's memory rather than a getvalue() copy
+    return pybase64.b64encode(buffer.getbuffer()).decode("ascii")
+
+
+# Base64 payloads above this size are decoded and hashed off the event loop
+_INLINE_DECODE_LIMIT = 1024 * 1024
+
+
+def _decode_and_digest(image_b64: str) -> tuple[bytes, bytes]:
+    """Decode the payload and return it with its cache key."""
+    image_bytes = pybase64.b64decode(image_b64)
+    return image_bytes, hashlib.blake2b(image_bytes, digest_size=16).digest()
 
 
 class GrayscaleProcessor(BaseProcessor):
@@ -45,6 +93,7 @@ class GrayscaleProcessor(BaseProcessor):
                 path="/image/grayscale",
                 request_model=GrayscaleRequest,
                 handler=self.handle_grayscale,
+                response_model=GrayscaleResponse,
                 summary="Convert a base64 image to grayscale PNG (base64).",
                 description=(
                     "Accepts any Pillow-supported image bytes in base64 form and returns "
@@ -53,7 +102,26 @@ class GrayscaleProcessor(BaseProcessor):
             ),
         ]
 
-    async def handle_grayscale(self, request: GrayscaleRequest) -> GrayscaleResponse:
-        image_bytes = base64.b64decode(request.image_b64)
-        grayscale_b64 = await run_blocking(_convert_to_grayscale, image_bytes)
-        return GrayscaleResponse(grayscale_b64=grayscale_b64)
+    async def handle_grayscale(self, request: GrayscaleRequest) -> Response:
+        if len(request.image_b64) > _INLINE_DECODE_LIMIT:
+            # Large payloads: decode and hash in a thread (both release the GIL)
+            image_bytes, key = await run_blocking(_decode_and_digest, request.image_b64)
+        else:
+            image_bytes, key = _decode_and_digest(request.image_b64)
+        grayscale_b64 = _GRAYSCALE_CACHE.get(key)
+        if grayscale_b64 is None:
+            if _IMAGE_POOL is not None:
+                loop = asyncio.get_running_loop()
+                grayscale_b64 = await loop.run_in_executor(_IMAGE_POOL, _convert_to_grayscale, image_bytes)
+            else:
+                # Served without the lifespan (e.g. in-process tests): use a thread
+                grayscale_b64 = await run_blocking(_convert_to_grayscale, image_bytes)
+            try:
+                _GRAYSCALE_CACHE[key] = grayscale_b64
+            except ValueError:
+                pass  # single result larger than the whole cache
+
+        # Built here from our own encoder output, so validation is skipped, and
+        # serialized by pydantic-core instead of FastAPI's jsonable_encoder pass
+        body = GrayscaleResponse.model_construct(grayscale_b64=grayscale_b64).model_dump_json()
+        return Response(content=body, media_type="application/json")
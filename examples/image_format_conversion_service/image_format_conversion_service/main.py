@@ -13,4 +13,4 @@ app = create_app(ImageConvertProcessor(), config)
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8010)
+    uvicorn.run(app, host="0.0.0.0", port=8010, loop="uvloop", http="httptools")
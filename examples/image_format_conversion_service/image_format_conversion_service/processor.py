@@ -6,10 +6,10 @@ from typing import List
 
 from fastapi import HTTPException
 from PIL import Image
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from stateless_microservice import BaseProcessor, StatelessAction
-from stateless_microservice.direct import fetch_s3_bytes, render_bytes, run_blocking
+from stateless_microservice.direct import fetch_s3_stream, render_bytes, run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +17,8 @@ logger = logging.getLogger(__name__)
 class ImageConvertRequest(BaseModel):
     """Request payload for image format conversion."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     source_uri: str = Field(..., description="Input image S3 URI")
     target_format: str = Field(
         ...,
@@ -53,16 +55,15 @@ class ImageConvertProcessor(BaseProcessor):
     async def handle_image_convert(self, payload: ImageConvertRequest):
         """Convert an image to the requested format."""
 
-        raw_bytes = await fetch_s3_bytes(payload.source_uri)
+        source = await fetch_s3_stream(payload.source_uri)
 
-        def _convert() -> bytes:
-            with Image.open(io.BytesIO(raw_bytes)) as img:
+        def _convert() -> io.BytesIO:
+            with Image.open(source) as img:
                 if payload.mode:
                     img = img.convert(payload.mode)
                 buffer = io.BytesIO()
                 img.save(buffer, format=payload.target_format.upper())
-                buffer.seek(0)
-                return buffer.read()
+                return buffer
 
         try:
             converted = await run_blocking(_convert)
@@ -2,7 +2,8 @@
 
 from typing import List
 
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 from stateless_microservice import BaseProcessor, StatelessAction
 
@@ -10,6 +11,8 @@ from stateless_microservice import BaseProcessor, StatelessAction
 class AppendPathParams(BaseModel):
     """Path parameters for the append operation."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     first: str = Field(..., description="First string to append.")
     second: str = Field(..., description="Second string to append.")
 
@@ -17,6 +20,8 @@ class AppendPathParams(BaseModel):
 class AppendResponse(BaseModel):
     """Response with the appended strings."""
 
+    model_config = ConfigDict(frozen=True)
+
     result: str = Field(..., description="The concatenated result of first + second.")
 
 
@@ -44,7 +49,8 @@ class StringAppenderProcessor(BaseProcessor):
             ),
         ]
 
-    async def handle_append(self, path_params: AppendPathParams) -> AppendResponse:
+    def handle_append(self, path_params: AppendPathParams) -> JSONResponse:
         """Append the two path parameters and return the result."""
-        result = path_params.first + path_params.second
-        return AppendResponse(result=result)
+        # Nothing to await, and returning a Response skips response-model validation;
+        # AppendResponse stays on the action for the OpenAPI schema.
+        return JSONResponse({"result": path_params.first + path_params.second})
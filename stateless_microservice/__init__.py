@@ -1,23 +1,44 @@
 """Stateless Microservice toolkit for synchronous FastAPI services."""
 
-from .processor import BaseProcessor, StatelessAction
-from .api import create_app, ServiceConfig
-from .config import settings
-from .direct import fetch_s3_bytes, run_blocking, render_bytes
-from .apache_conf import ApacheConfigParams, generate_apache_vhost_config
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - import only for typing
+    from .processor import BaseProcessor, StatelessAction
+    from .api import create_app, ServiceConfig
+    from .config import settings
+    from .direct import fetch_s3_bytes, run_blocking, render_bytes
+    from .apache_conf import ApacheConfigParams, generate_apache_vhost_config
 
 __version__ = "1.0.0"
 
 
-__all__ = [
-    "BaseProcessor",
-    "StatelessAction",
-    "create_app",
-    "ServiceConfig",
-    "settings",
-    "fetch_s3_bytes",
-    "run_blocking",
-    "render_bytes",
-    "ApacheConfigParams",
-    "generate_apache_vhost_config",
-]
+# Public names resolved on first access (PEP 562), so importing a submodule
+# such as aggregate_openapi does not pull in FastAPI, boto3 or argparse
+_EXPORTS = {
+    "BaseProcessor": ".processor",
+    "StatelessAction": ".processor",
+    "create_app": ".api",
+    "ServiceConfig": ".api",
+    "settings": ".config",
+    "fetch_s3_bytes": ".direct",
+    "run_blocking": ".direct",
+    "render_bytes": ".direct",
+    "ApacheConfigParams": ".apache_conf",
+    "generate_apache_vhost_config": ".apache_conf",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_EXPORTS])
@@ -11,6 +11,10 @@ Usage:
   # Start the docs server at a subpath (e.g., for /api-docs prefix)
   aggregate-openapi https://hostname/service1 https://hostname/service2 --path /api-docs
 
+  # Reuse the aggregated spec across restarts for up to an hour
+  aggregate-openapi https://hostname/service1 https://hostname/service2 \
+    --cache-file .cache/openapi.json --max-age 3600
+
   # Generate Apache config (to stdout) and start server
   aggregate-openapi https://hostname/service1 https://hostname/service2 \
     --apache-config --hostname api-docs.example.com
@@ -20,103 +24,306 @@ Usage:
     --path /api-docs --apache-config --hostname example.com --output api-docs.conf
 """
 
-import argparse
-import json
+import asyncio
+import functools
+import gzip
+import hashlib
+import sys
+import time
 from pathlib import Path
-from urllib.request import urlopen
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+
+from stateless_microservice.models import SHARED_MODELS
+
+if TYPE_CHECKING:  # pragma: no cover - import only for typing
+    from fastapi import FastAPI
+
+
+# Specs memoized per service URL for the life of the process (see aggregate_specs)
+_SPEC_CACHE: dict[str, dict] = {}
+
+# Last ETag/Last-Modified seen per service URL, with the spec they validate.
+# Persisted between runs with load_validators/save_validators.
+_VALIDATORS: dict[str, dict] = {}
+
+
+def _is_validator_entry(entry) -> bool:
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("spec"), dict)
+        and all(isinstance(entry.get(key), (str, type(None))) for key in ("etag", "last_modified"))
+    )
+
+
+def load_validators(path: Path) -> None:
+    """Load upstream ETag/Last-Modified validators saved by a previous run.
 
-import uvicorn
-from fastapi import FastAPI
-from pydantic import BaseModel
+    A missing or malformed file, and any entry of the wrong shape, is ignored.
+    """
+    try:
+        saved = orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return
+    if isinstance(saved, dict):
+        _VALIDATORS.update(
+            (url, entry) for url, entry in saved.items() if _is_validator_entry(entry)
+        )
+
+
+def save_validators(path: Path) -> None:
+    """Persist upstream validators so the next run can make conditional requests."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps(_VALIDATORS))
+
+
+async def fetch_openapi_spec(client: httpx.AsyncClient, url: str) -> dict:
+    """
+    Fetch OpenAPI spec from a service URL.
+
+    Sends If-None-Match/If-Modified-Since when validators are known for the
+    URL and reuses the stored spec on 304 Not Modified.
+    """
+    entry = _VALIDATORS.get(url)
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = await client.get(f"{url.rstrip('/')}/openapi.json", headers=headers)
+    if response.status_code == 304 and entry:
+        return entry["spec"]
+    response.raise_for_status()
+    spec = orjson.loads(response.content)
+
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if etag or last_modified:
+        _VALIDATORS[url] = {"etag": etag, "last_modified": last_modified, "spec": spec}
+    else:
+        _VALIDATORS.pop(url, None)
+    return spec
+
+
+async def _fetch_specs(service_urls: list[str]) -> list[dict]:
+    """Fetch specs not already cached, concurrently over one pooled client."""
+    missing = [url for url in dict.fromkeys(service_urls) if url not in _SPEC_CACHE]
+    if missing:
+        async with httpx.AsyncClient(
+            timeout=10,
+            # Services behind http->https or trailing-slash redirects still resolve
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        ) as client:
+            # A failing service cancels the remaining fetches instead of leaving them running
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(fetch_openapi_spec(client, url)) for url in missing]
+        _SPEC_CACHE.update((url, task.result()) for url, task in zip(missing, tasks))
+    return [_SPEC_CACHE[url] for url in service_urls]
+
+
+# OpenAPI 3.1.0 component types
+COMPONENT_TYPES = (
+    "schemas",
+    "responses",
+    "parameters",
+    "examples",
+    "requestBodies",
+    "headers",
+    "securitySchemes",
+    "links",
+    "callbacks",
+    "pathItems",
+)
+
+
+def _service_spec(url: str, spec: dict) -> dict:
+    """Reduce a fetched spec to service-prefixed paths and its component sections."""
+    service_name = url.rstrip("/").split("/")[-1]
+    service_title = spec.get("info", {}).get("title", service_name)
+
+    print(f"  Loaded: {service_title}")
+
+    prefix = f"/{service_name}"
+    paths = {prefix + path: methods for path, methods in spec.get("paths", {}).items()}
+
+    # Fresh section dicts so merging never mutates the fetched spec
+    spec_components = spec.get("components", {})
+    components = {
+        component_type: dict(spec_components.get(component_type, {}))
+        for component_type in COMPONENT_TYPES
+    }
+    return {"paths": paths, "components": components}
+
+
+def _merge_two(left: dict, right: dict) -> dict:
+    """Merge the paths and components of ``right`` into ``left``."""
+    left["paths"].update(right["paths"])
 
-from stateless_microservice import models
-from stateless_microservice.apache_conf import ApacheConfigParams, generate_apache_vhost_config, normalize_backend, sanitize_path
+    for component_type in COMPONENT_TYPES:
+        section = left["components"][component_type]
+        incoming = right["components"][component_type]
 
+        collisions = section.keys() & incoming.keys()
+        if collisions:
+            # Known shared models from stateless_microservice may repeat (schemas only)
+            conflicts = collisions - SHARED_MODELS if component_type == "schemas" else collisions
+            if conflicts:
+                names = ", ".join(f"'{name}'" for name in sorted(conflicts))
+                raise RuntimeError(
+                    f"{component_type} naming conflict: {names} exists in multiple services"
+                )
+            # Keep the first definition of each shared model
+            incoming = {name: item_def for name, item_def in incoming.items() if name not in collisions}
 
-# Dynamically get all model names from stateless_microservice.models
-SHARED_MODELS = {
-    name for name in dir(models)
-    if not name.startswith("_") and isinstance(getattr(models, name), type) and issubclass(getattr(models, name), BaseModel)
-}
+        section.update(incoming)
 
+    return left
 
-def fetch_openapi_spec(url: str) -> dict:
-    """Fetch OpenAPI spec from a service URL."""
-    url = f"{url.rstrip('/')}/openapi.json"
-    with urlopen(url, timeout=10) as response:
-        return json.loads(response.read())
 
+async def aggregate_specs(service_urls: list[str], refresh: bool = False) -> dict:
+    """
+    Fetch and merge OpenAPI specs from multiple services.
 
-def aggregate_specs(service_urls: list[str]) -> dict:
-    """Fetch and merge OpenAPI specs from multiple services."""
-    aggregated = {
+    Fetched specs are reused by later calls in the same process; pass
+    ``refresh=True`` to drop them and re-download.
+    """
+    if refresh:
+        _SPEC_CACHE.clear()
+
+    # Fetch all specs concurrently; merging is plain dict work and stays sequential
+    specs = await _fetch_specs(service_urls)
+
+    merged = [_service_spec(url, spec) for url, spec in zip(service_urls, specs)]
+
+    # Fold into the first service's dicts; each merge costs only the incoming entries
+    if merged:
+        combined = functools.reduce(_merge_two, merged)
+        paths, components = combined["paths"], combined["components"]
+    else:
+        paths, components = {}, {component_type: {} for component_type in COMPONENT_TYPES}
+
+    return {
         "openapi": "3.1.0",
         "info": {
             "title": "Aggregated Microservices API",
             "version": "1.0.0",
             "description": "API documentation for multiple microservices"
         },
-        "paths": {},
-        "components": {},
+        "paths": paths,
+        "components": components,
     }
 
-    # OpenAPI 3.1.0 component types
-    component_types = [
-        "schemas",
-        "responses",
-        "parameters",
-        "examples",
-        "requestBodies",
-        "headers",
-        "securitySchemes",
-        "links",
-        "callbacks",
-        "pathItems"
-    ]
-
-    # Initialize all component sections
-    for component_type in component_types:
-        aggregated["components"][component_type] = {}
-
-    for url in service_urls:
-        spec = fetch_openapi_spec(url)
-
-        service_name = url.rstrip("/").split("/")[-1]
-        service_title = spec.get("info", {}).get("title", service_name)
-
-        print(f"  Loaded: {service_title}")
-
-        # Merge paths with service name prefix
-        for path, methods in spec.get("paths", {}).items():
-            prefixed_path = f"/{service_name}{path}"
-            aggregated["paths"][prefixed_path] = methods
-
-        # Merge all component sections
-        if "components" in spec:
-            for component_type in component_types:
-                if component_type not in spec["components"]:
-                    continue
-
-                for item_name, item_def in spec["components"][component_type].items():
-                    if item_name in aggregated["components"][component_type]:
-                        # Skip known shared models from stateless_microservice (schemas only)
-                        if component_type == "schemas" and item_name in SHARED_MODELS:
-                            continue
-                        raise RuntimeError(
-                            f"{component_type} naming conflict: '{item_name}' exists in multiple services"
-                        )
-                    aggregated["components"][component_type][item_name] = item_def
-
-    return aggregated
-
-
-def create_gateway_app(aggregated_spec: dict, root_path: str = "") -> FastAPI:
-    """Create a FastAPI app that serves the aggregated OpenAPI spec."""
+
+def load_cached_spec(cache_file: Path, service_urls: list[str], max_age: int) -> dict | None:
+    """
+    Return a previously aggregated spec from disk if it is still usable.
+
+    The cache is ignored when it is missing, older than ``max_age`` seconds,
+    unreadable, or was built from a different list of service URLs.
+    """
+    try:
+        if time.time() - cache_file.stat().st_mtime >= max_age:
+            return None
+        cached = orjson.loads(cache_file.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    # Valid JSON of the wrong shape is as unusable as a corrupt file
+    if not isinstance(cached, dict) or cached.get("urls") != service_urls:
+        return None
+    spec = cached.get("spec")
+    return spec if isinstance(spec, dict) else None
+
+
+def write_cached_spec(cache_file: Path, service_urls: list[str], aggregated_spec: dict) -> None:
+    """Persist an aggregated spec, keyed by the service URLs it was built from."""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_bytes(orjson.dumps({"urls": service_urls, "spec": aggregated_spec}))
+
+
+@functools.lru_cache(maxsize=64)
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values.
+
+    gzip is acceptable when listed with q > 0, or when unlisted and ``*``
+    has q > 0 (RFC 9110, section 12.5.3).
+    """
+    gzip_q = star_q = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "gzip":
+            gzip_q = q
+        elif coding == "*":
+            star_q = q
+    if gzip_q is None:
+        gzip_q = star_q or 0.0
+    return gzip_q > 0
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match list matches ``etag`` (weak comparison, ``*`` matches any)."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def create_gateway_app(aggregated_spec: dict, root_path: str = "", cache_max_age: int = 86400) -> "FastAPI":
+    """
+    Create a FastAPI app that serves the aggregated OpenAPI spec.
+
+    ``cache_max_age`` sets how long (in seconds) clients may reuse the spec
+    before revalidating it against its ETag.
+    """
+    from fastapi import FastAPI, Request, Response
+    from fastapi.middleware.gzip import GZipMiddleware
+    from fastapi.openapi.docs import (
+        get_redoc_html,
+        get_swagger_ui_html,
+        get_swagger_ui_oauth2_redirect_html,
+    )
+    from starlette.datastructures import Headers
+
+    class QValueGZipMiddleware(GZipMiddleware):
+        """GZipMiddleware that leaves requests alone unless gzip is actually acceptable.
+
+        The stock middleware only checks for the substring "gzip", so it would
+        compress for "gzip;q=0". Deciding with _accepts_gzip here also keeps it
+        in agreement with the /openapi.json endpoint.
+        """
+
+        async def __call__(self, scope, receive, send):
+            if scope["type"] == "http" and not _accepts_gzip(
+                Headers(scope=scope).get("accept-encoding", "")
+            ):
+                await self.app(scope, receive, send)
+                return
+            await super().__call__(scope, receive, send)
+
     app = FastAPI(
         title=aggregated_spec["info"]["title"],
         version=aggregated_spec["info"]["version"],
         description=aggregated_spec["info"]["description"],
         root_path=root_path,
+        # Built-in spec/docs routes re-serialize on every hit; registered below instead
+        openapi_url=None,
+        docs_url=None,
+        redoc_url=None,
     )
 
     # Override the openapi method to return our aggregated spec
@@ -125,19 +332,76 @@ def create_gateway_app(aggregated_spec: dict, root_path: str = "") -> FastAPI:
 
     app.openapi = custom_openapi
 
+    # Compress the docs pages and any other sizeable responses
+    app.add_middleware(QValueGZipMiddleware, minimum_size=1024, compresslevel=6)
+
+    # The aggregated spec never changes for the process lifetime, so encode
+    # (and compress) it once; the middleware skips already-encoded bodies
+    spec_bytes = orjson.dumps(aggregated_spec)
+    spec_gzip = gzip.compress(spec_bytes, compresslevel=9)
+    spec_digest = hashlib.blake2b(spec_bytes, digest_size=16).hexdigest()
+    cache_control = f"public, max-age={cache_max_age}"
+    identity_headers = {"ETag": f'"{spec_digest}"', "Vary": "Accept-Encoding", "Cache-Control": cache_control}
+    gzip_headers = {"ETag": f'"{spec_digest}-gzip"', "Vary": "Accept-Encoding", "Cache-Control": cache_control}
+    # Clients refusing gzip bypass the middleware, so identity bodies carry
+    # their own Vary; pre-compressed ones are passed through untouched
+    gzip_body_headers = {**gzip_headers, "Content-Encoding": "gzip"}
+
+    @app.get("/openapi.json", include_in_schema=False)
+    async def openapi_json(request: Request):
+        if _accepts_gzip(request.headers.get("accept-encoding", "")):
+            content, headers, body_headers = spec_gzip, gzip_headers, gzip_body_headers
+        else:
+            content, headers, body_headers = spec_bytes, identity_headers, identity_headers
+        if _etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=content, media_type="application/json", headers=body_headers)
+
+    @app.get("/docs", include_in_schema=False)
+    async def swagger_ui_html(request: Request):
+        root = request.scope.get("root_path", "").rstrip("/")
+        return get_swagger_ui_html(
+            openapi_url=root + "/openapi.json",
+            title=f"{app.title} - Swagger UI",
+            oauth2_redirect_url=root + "/docs/oauth2-redirect",
+        )
+
+    # Swagger UI's "Authorize" flow returns here for specs with OAuth2 security schemes
+    @app.get("/docs/oauth2-redirect", include_in_schema=False)
+    async def swagger_ui_redirect():
+        return get_swagger_ui_oauth2_redirect_html()
+
+    @app.get("/redoc", include_in_schema=False)
+    async def redoc_html(request: Request):
+        openapi_url = request.scope.get("root_path", "").rstrip("/") + "/openapi.json"
+        return get_redoc_html(openapi_url=openapi_url, title=f"{app.title} - ReDoc")
+
+    root_bytes = orjson.dumps({
+        "message": "Aggregated Microservices Gateway",
+        "docs": f"{root_path}/docs",
+        "redoc": f"{root_path}/redoc",
+        "openapi": f"{root_path}/openapi.json"
+    })
+
     @app.get("/")
     async def root():
-        return {
-            "message": "Aggregated Microservices Gateway",
-            "docs": f"{root_path}/docs",
-            "redoc": f"{root_path}/redoc",
-            "openapi": f"{root_path}/openapi.json"
-        }
+        return Response(content=root_bytes, media_type="application/json")
 
     return app
 
 
 def main():
+    # CLI-only dependencies; importing this module for aggregate_specs stays cheap
+    import argparse
+
+    from stateless_microservice.apache_conf import (
+        ApacheConfigParams,
+        generate_apache_vhost_config,
+        normalize_backend,
+        sanitize_path,
+        write_config_file,
+    )
+
     parser = argparse.ArgumentParser(
         description="Aggregate OpenAPI specs from multiple microservices and serve them"
     )
@@ -152,6 +416,22 @@ def main():
         default=8000,
         help="Port to serve on (default: 8000)"
     )
+    parser.add_argument(
+        "--cache-file",
+        help="Reuse the aggregated spec stored at this path and refresh it when stale"
+    )
+    parser.add_argument(
+        "--max-age",
+        type=int,
+        default=86400,
+        help="Seconds the --cache-file spec is reused before re-fetching upstream (default: 86400)"
+    )
+    parser.add_argument(
+        "--cache-control-max-age",
+        type=int,
+        default=86400,
+        help="Cache-Control max-age, in seconds, sent with /openapi.json (default: 86400)"
+    )
 
     # Apache config generation options
     apache_group = parser.add_argument_group("Apache config generation")
@@ -195,6 +475,12 @@ def main():
 
     args = parser.parse_args()
 
+    # Fail fast on malformed service URLs before any network access
+    for url in args.urls:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            parser.error(f"Service URL must include scheme (http:// or https://) and host, got: {url}")
+
     # If generating Apache config
     if args.apache_config:
         if not args.hostname:
@@ -220,18 +506,29 @@ def main():
         config_text = generate_apache_vhost_config(params)
 
         if args.output == "-":
-            print("\n" + "="*60)
-            print("Apache Configuration:")
-            print("="*60)
-            print(config_text)
-            print("="*60 + "\n")
+            # One binary write for the banner and config; flush earlier print()s first
+            rule = "=" * 60
+            block = f"\n{rule}\nApache Configuration:\n{rule}\n{config_text}\n{rule}\n\n"
+            sys.stdout.flush()
+            sys.stdout.buffer.write(block.encode("utf-8"))
+            sys.stdout.flush()
         else:
             output_path = Path(args.output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(config_text + "\n")
+            write_config_file(config_text, output_path)
             print(f"Wrote Apache config to {output_path}\n")
 
-    aggregated = aggregate_specs(args.urls)
+    cache_file = Path(args.cache_file) if args.cache_file else None
+    aggregated = load_cached_spec(cache_file, args.urls, args.max_age) if cache_file else None
+    if aggregated is not None:
+        print(f"Loaded aggregated spec from {cache_file}")
+    else:
+        validators_file = cache_file.with_name(cache_file.name + ".etags") if cache_file else None
+        if validators_file:
+            load_validators(validators_file)
+        aggregated = asyncio.run(aggregate_specs(args.urls))
+        if cache_file:
+            write_cached_spec(cache_file, args.urls, aggregated)
+            save_validators(validators_file)
 
     print(f"\nAggregated {len(aggregated['paths'])} endpoints from {len(args.urls)} services")
 
@@ -239,7 +536,7 @@ def main():
     root_path = args.path.rstrip("/") if args.path != "/" else ""
 
     # Serve with FastAPI
-    app = create_gateway_app(aggregated, root_path=root_path)
+    app = create_gateway_app(aggregated, root_path=root_path, cache_max_age=args.cache_control_max_age)
     print(f"\nServing aggregated API docs at:")
 
     # Show public URLs if hostname is provided, otherwise show localhost
@@ -254,7 +551,17 @@ def main():
         print(f"   ReDoc:      http://localhost:{args.port}{root_path}/redoc")
         print(f"   OpenAPI:    http://localhost:{args.port}{root_path}/openapi.json")
 
-    uvicorn.run(app, host="0.0.0.0", port=args.port)
+    import uvicorn
+
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=args.port,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
 
 
 if __name__ == "__main__":
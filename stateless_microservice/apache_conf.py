@@ -1,6 +1,7 @@
 """Utilities for generating Apache reverse-proxy configs for Amplify services."""
 
 import argparse
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from textwrap import dedent
@@ -154,6 +155,14 @@ def generate_apache_vhost_config(params: ApacheConfigParams, template: str = DEF
     return "\n".join(line.rstrip() for line in rendered.splitlines())
 
 
+def write_config_file(config_text: str, output_path: Path) -> None:
+    """Write a rendered config to disk, creating parent directories as needed."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("wb") as handle:
+        handle.write(config_text.encode("utf-8"))
+        handle.write(b"\n")
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Generate an Apache reverse-proxy config for an Amplify microservice.",
@@ -206,11 +215,11 @@ def main(argv: list[str] | None = None) -> int:
     config_text = generate_apache_vhost_config(params)
 
     if args.output == "-":
-        print(config_text)
+        sys.stdout.buffer.write(config_text.encode("utf-8") + b"\n")
+        sys.stdout.flush()
     else:
         output_path = Path(args.output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(config_text + "\n")
+        write_config_file(config_text, output_path)
         print(f"Wrote Apache config to {output_path}")
 
     return 0
@@ -1,19 +1,134 @@
 """FastAPI application factory for stateless request/response services."""
 
+import functools
 import inspect
+import json
 import logging
 import re
 from dataclasses import dataclass
+from typing import Any, Callable
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
 from pydantic import BaseModel, ValidationError
 
+from .direct import binary_response_class
 from .models import ErrorResponse, HealthResponse
 from .processor import BaseProcessor, StatelessAction
 
 logger = logging.getLogger(__name__)
 
+_PATH_PARAM_RE = re.compile(r"\{(\w+)\}")
+
+# A run of 19+ digits may be an integer outside orjson's 64-bit range, which it
+# would silently decode as a float
+_LONG_DIGITS_RE = re.compile(rb"\d{19,}")
+
+
+def _loads_json(body: bytes) -> Any:
+    """Decode with orjson, falling back to the stdlib for input orjson cannot represent.
+
+    The fallback covers integers wider than 64 bits (kept exact) and the
+    NaN/Infinity literals json.loads accepts, so request bodies are accepted
+    exactly as with FastAPI's default parser.
+    """
+    if _LONG_DIGITS_RE.search(body) is None:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(body)
+
+
+class _OrjsonRequest(Request):
+    """Request that parses JSON bodies with orjson instead of the stdlib.
+
+    Malformed bodies still raise json.JSONDecodeError from the fallback, so
+    FastAPI reports them as 422 json_invalid errors.
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = _loads_json(await self.body())
+        return self._json
+
+
+class _StatelessRoute(APIRoute):
+    """Route class for stateless actions; request models are still validated by FastAPI."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(_OrjsonRequest(request.scope, request.receive))
+
+        return route_handler
+
+
+# Endpoint factories, one per (has path params, has request model) shape. Each
+# returns a closure whose signature FastAPI inspects to build request parsing.
+# Coroutine functions are awaited without a per-call check; any other handler
+# may still return an awaitable (lambdas, sync wrappers), so its result is checked.
+
+
+def _path_and_body_endpoint(handler, handler_is_coroutine, finish, PathParamsModel, RequestModel):
+    async def endpoint(request: Request, payload: RequestModel):
+        call_result = handler(payload, PathParamsModel.model_validate(request.path_params))
+        if handler_is_coroutine or inspect.isawaitable(call_result):
+            call_result = await call_result
+        return finish(call_result) if finish else call_result
+
+    return endpoint
+
+
+def _path_endpoint(handler, handler_is_coroutine, finish, PathParamsModel, RequestModel):
+    async def endpoint(request: Request):
+        call_result = handler(PathParamsModel.model_validate(request.path_params))
+        if handler_is_coroutine or inspect.isawaitable(call_result):
+            call_result = await call_result
+        return finish(call_result) if finish else call_result
+
+    return endpoint
+
+
+def _body_endpoint(handler, handler_is_coroutine, finish, PathParamsModel, RequestModel):
+    async def endpoint(payload: RequestModel):
+        call_result = handler(payload)
+        if handler_is_coroutine or inspect.isawaitable(call_result):
+            call_result = await call_result
+        return finish(call_result) if finish else call_result
+
+    return endpoint
+
+
+def _bare_endpoint(handler, handler_is_coroutine, finish, PathParamsModel, RequestModel):
+    async def endpoint():
+        call_result = handler()
+        if handler_is_coroutine or inspect.isawaitable(call_result):
+            call_result = await call_result
+        return finish(call_result) if finish else call_result
+
+    return endpoint
+
+
+_ENDPOINT_FACTORIES = {
+    (True, True): _path_and_body_endpoint,
+    (True, False): _path_endpoint,
+    (False, True): _body_endpoint,
+    (False, False): _bare_endpoint,
+}
+
+
+@functools.cache
+def _configure_logging() -> None:
+    """Install the default log format once per process, not once per app."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
 
 @dataclass
 class ServiceConfig:
@@ -24,11 +139,13 @@ class ServiceConfig:
         name: Override service name (defaults to processor.name)
         version: Override service version (defaults to processor.version)
         description: Short description for generated docs
+        lifespan: Optional FastAPI lifespan context for per-process startup/shutdown
     """
 
     name: str | None = None
     version: str | None = None
     description: str | None = None
+    lifespan: Callable[[FastAPI], Any] | None = None
 
 
 def create_app(processor: BaseProcessor, config: ServiceConfig | None = None) -> FastAPI:
@@ -38,10 +155,7 @@ def create_app(processor: BaseProcessor, config: ServiceConfig | None = None) ->
 
     config = config or ServiceConfig()
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+    _configure_logging()
 
     service_name = config.name or processor.name
     service_version = config.version or processor.version
@@ -51,6 +165,7 @@ def create_app(processor: BaseProcessor, config: ServiceConfig | None = None) ->
         title=f"{service_name.title()} Stateless API",
         description=service_description,
         version=service_version,
+        lifespan=config.lifespan,
     )
 
     app.state.processor = processor
@@ -64,13 +179,16 @@ def create_app(processor: BaseProcessor, config: ServiceConfig | None = None) ->
             content={"error": "Validation error", "detail": str(exc)},
         )
 
+    # Health payload is constant per app; serialize once and skip response validation
+    health_bytes = HealthResponse(status="healthy", version=service_version).model_dump_json().encode()
+
     @app.get("/", response_model=HealthResponse)
     async def root():
-        return HealthResponse(status="healthy", version=service_version)
+        return Response(content=health_bytes, media_type="application/json")
 
     @app.get("/health", response_model=HealthResponse)
     async def health_check():
-        return HealthResponse(status="healthy", version=service_version)
+        return Response(content=health_bytes, media_type="application/json")
 
     actions = processor.get_stateless_actions()
     if not actions:
@@ -83,67 +201,40 @@ def create_app(processor: BaseProcessor, config: ServiceConfig | None = None) ->
         PathParamsModel = action.path_params_model
         RequestModel = action.request_model
         has_request_model = RequestModel is not None
-
-        if PathParamsModel and has_request_model:
-            # Both request and path params
-            async def endpoint(request: Request, payload: RequestModel):
-                path_params = PathParamsModel(**request.path_params)
-                call_result = action.handler(payload, path_params)
-
-                if inspect.isawaitable(call_result):
-                    call_result = await call_result
-                if isinstance(call_result, Response):
-                    return call_result
-                if action.media_type and isinstance(call_result, (bytes, bytearray, memoryview)):
-                    return Response(content=bytes(call_result), media_type=action.media_type)
-                return call_result
-        elif PathParamsModel:
-            # Only path params
-            async def endpoint(request: Request):
-                path_params = PathParamsModel(**request.path_params)
-                call_result = action.handler(path_params)
-
-                if inspect.isawaitable(call_result):
-                    call_result = await call_result
-                if isinstance(call_result, Response):
-                    return call_result
-                if action.media_type and isinstance(call_result, (bytes, bytearray, memoryview)):
-                    return Response(content=bytes(call_result), media_type=action.media_type)
-                return call_result
-        elif has_request_model:
-            # Only request model
-            async def endpoint(payload: RequestModel):
-                call_result = action.handler(payload)
-
-                if inspect.isawaitable(call_result):
-                    call_result = await call_result
-                if isinstance(call_result, Response):
-                    return call_result
-                if action.media_type and isinstance(call_result, (bytes, bytearray, memoryview)):
-                    return Response(content=bytes(call_result), media_type=action.media_type)
+        handler = action.handler
+        media_type = action.media_type
+
+        # Per-action invariants, resolved once here rather than on every request
+        handler_is_coroutine = inspect.iscoroutinefunction(handler)
+
+        binary_response = binary_response_class(media_type) if media_type else None
+
+        if media_type and inspect.signature(handler).return_annotation in (bytes, "bytes"):
+            # Handler promises bytes, so no type dispatch is needed per response
+            finish = binary_response
+        elif media_type:
+            def finish(call_result):
+                if type(call_result) is bytes:
+                    return binary_response(call_result)
+                if isinstance(call_result, (bytearray, memoryview)):
+                    return binary_response(bytes(call_result))
                 return call_result
         else:
-            # No request or path params
-            async def endpoint():
-                call_result = action.handler()
-
-                if inspect.isawaitable(call_result):
-                    call_result = await call_result
-                if isinstance(call_result, Response):
-                    return call_result
-                if action.media_type and isinstance(call_result, (bytes, bytearray, memoryview)):
-                    return Response(content=bytes(call_result), media_type=action.media_type)
-                return call_result
+            # Results (including Response objects) go straight back to FastAPI
+            finish = None
+
+        factory = _ENDPOINT_FACTORIES[(PathParamsModel is not None, has_request_model)]
+        return factory(handler, handler_is_coroutine, finish, PathParamsModel, RequestModel)
 
-        return endpoint
+    error_responses = {400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}}
 
     for action in actions:
         logger.info("Registering stateless action '%s' at %s", action.name, action.path)
 
         if action.path_params_model:
-            path_param_names = set(re.findall(r'\{(\w+)\}', action.path))
+            path_param_names = set(_PATH_PARAM_RE.findall(action.path))
 
-            model_field_names = set(action.path_params_model.model_fields.keys())
+            model_field_names = set(action.path_params_model.model_fields)
 
             if path_param_names != model_field_names:
                 raise ValueError(
@@ -154,16 +245,18 @@ def create_app(processor: BaseProcessor, config: ServiceConfig | None = None) ->
 
         endpoint = make_endpoint(action)
 
-        route_kwargs = {
-            "methods": list(action.methods),
-            "response_model": action.response_model,
-            "summary": action.summary,
-            "description": action.description,
-            "tags": list(action.tags) if action.tags else None,
-            "responses": {400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
-        }
-        route_kwargs = {k: v for k, v in route_kwargs.items() if v is not None}
-
-        app.api_route(action.path, **route_kwargs)(endpoint)
+        route_kwargs = {"methods": action.methods, "responses": error_responses}
+        if action.response_model is not None:
+            route_kwargs["response_model"] = action.response_model
+        if action.summary is not None:
+            route_kwargs["summary"] = action.summary
+        if action.description is not None:
+            route_kwargs["description"] = action.description
+        if action.tags:
+            route_kwargs["tags"] = list(action.tags)
+
+        app.router.add_api_route(
+            action.path, endpoint, route_class_override=_StatelessRoute, **route_kwargs
+        )
 
     return app
@@ -29,6 +29,16 @@ class Settings(BaseSettings):
     # Optional default prefixes for generated URIs
     s3_assets_prefix: str = "assets"
 
+    # Lifetime of pre-signed multipart upload part URLs
+    multipart_url_ttl_seconds: int = 3600
+
+    # How long S3Client.object_exists reuses a HEAD result (0 disables caching)
+    object_exists_ttl_seconds: float = 2.0
+
+    # Worker thread pools (S3 transfers are kept apart from run_blocking work)
+    s3_pool_size: int = 64
+    blocking_pool_size: Optional[int] = None  # None uses the ThreadPoolExecutor default
+
 
 # Global settings instance
 settings = Settings()
@@ -1,34 +1,74 @@
 """Utilities for building stateless IFCB microservices."""
 
 import asyncio
+import contextvars
+import functools
 import io
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Awaitable, Callable, TYPE_CHECKING
 
+from botocore.exceptions import ClientError
 from fastapi import HTTPException, Response
 
+from .config import settings
+
 if TYPE_CHECKING:  # pragma: no cover - import only for typing
     from .storage import S3Client
 
 
+# Dedicated pools so slow S3 transfers and CPU-bound run_blocking calls
+# cannot starve each other (or the loop's default executor)
+_S3_EXECUTOR = ThreadPoolExecutor(max_workers=settings.s3_pool_size, thread_name_prefix="s3")
+_BLOCKING_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.blocking_pool_size, thread_name_prefix="run-blocking"
+)
+
+
+_S3_URI_RE = re.compile(r"s3://([^/]*)/(.*)", re.DOTALL)
+
+# S3 error codes mapped to the status returned to clients; anything else is a 500
+_S3_ERROR_STATUS = {
+    "NoSuchKey": 404,
+    "NotFound": 404,
+    "404": 404,
+    "AccessDenied": 403,
+    "403": 403,
+    "SlowDown": 503,
+    "ServiceUnavailable": 503,
+    "503": 503,
+}
+
+
+async def _run_in(executor: ThreadPoolExecutor, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Like asyncio.to_thread, but on the given executor."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
+
+
 def _get_s3_client() -> "S3Client":
     from .storage import get_s3_client
 
     return get_s3_client()
 
 
-def _parse_s3_uri(uri: str) -> str:
-    client = _get_s3_client()
+def _read_object(key: str) -> bytes:
+    # Runs on the S3 pool: the first call also builds the client and checks
+    # the bucket, which are blocking round-trips of their own
+    return _get_s3_client().get_object_bytes(key)
+
 
-    if not uri.startswith("s3://"):
+def _parse_s3_uri(uri: str) -> str:
+    match = _S3_URI_RE.fullmatch(uri)
+    if match is None:
         raise HTTPException(status_code=400, detail=f"Invalid S3 URI: {uri}")
-    parts = uri[5:].split("/", 1)
-    if len(parts) != 2:
-        raise HTTPException(status_code=400, detail=f"Invalid S3 URI format: {uri}")
-    bucket, key = parts
-    if bucket != client.bucket:
+    bucket, key = match.groups()
+    # The client's bucket always comes from settings, so no client is needed to validate
+    if bucket != settings.s3_bucket:
         raise HTTPException(
             status_code=400,
-            detail=f"URI bucket {bucket} does not match configured bucket {client.bucket}",
+            detail=f"URI bucket {bucket} does not match configured bucket {settings.s3_bucket}",
         )
     if not key:
         raise HTTPException(status_code=400, detail=f"Missing key in S3 URI: {uri}")
@@ -39,23 +79,42 @@ async def fetch_s3_bytes(uri: str) -> bytes:
     """
     Download object bytes for the given S3 URI.
 
-    Raises HTTPException with status 404 if object missing.
+    Raises HTTPException with status 404 if the object is missing, 403 if
+    access is denied, 503 if S3 is throttling, and 500 for other S3 errors.
+    Transport errors propagate unchanged.
     """
 
     key = _parse_s3_uri(uri)
 
-    client = _get_s3_client()
+    try:
+        return await _run_in(_S3_EXECUTOR, _read_object, key)
+    except ClientError as exc:
+        code = exc.response.get("Error", {}).get("Code")
+        status_code = _S3_ERROR_STATUS.get(code, 500)
+        raise HTTPException(status_code=status_code, detail=f"Failed to fetch {uri}: {exc}") from exc
 
-    def _download() -> bytes:
-        buffer = io.BytesIO()
-        client.download_fileobj(key, buffer)
-        buffer.seek(0)
-        return buffer.read()
 
-    try:
-        return await asyncio.to_thread(_download)
-    except Exception as exc:  # pragma: no cover - boto3 exceptions not easily modeled
-        raise HTTPException(status_code=404, detail=f"Failed to fetch {uri}: {exc}") from exc
+class _BytesStream(io.BytesIO):
+    """
+    BytesIO over downloaded bytes.
+
+    CPython shares the initial bytes object until the stream is written to or
+    getbuffer() is called, so render_bytes sends it through getvalue(), which
+    returns that shared object as-is.
+    """
+
+
+async def fetch_s3_stream(uri: str) -> io.BytesIO:
+    """
+    Download the given S3 URI into an in-memory stream.
+
+    Prefer this over fetch_s3_bytes when the object is parsed in place
+    (PIL.Image.open, numpy.load, h5py); the stream shares the downloaded
+    bytes rather than copying them, and passing it back to render_bytes
+    sends those same bytes. Raises HTTPException like fetch_s3_bytes.
+    """
+
+    return _BytesStream(await fetch_s3_bytes(uri))
 
 
 async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
@@ -63,15 +122,34 @@ async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> A
     Run a blocking function in a thread pool to avoid blocking the event loop.
     """
 
-    return await asyncio.to_thread(func, *args, **kwargs)
+    return await _run_in(_BLOCKING_EXECUTOR, func, *args, **kwargs)
 
 
-def render_bytes(payload: bytes | bytearray | memoryview, media_type: str) -> Response:
+@functools.lru_cache(maxsize=32)
+def binary_response_class(media_type: str) -> type[Response]:
+    """Response subclass with ``media_type`` fixed, so instances need only content."""
+    return type("BinaryResponse", (Response,), {"media_type": media_type})
+
+
+def render_bytes(payload: bytes | bytearray | memoryview | io.BytesIO, media_type: str) -> Response:
     """
     Shortcut for returning binary payloads from stateless actions.
+
+    BytesIO buffers the caller wrote into are sent from their underlying
+    memory without a copy, as are streams from fetch_s3_stream. bytearray and
+    memoryview payloads are copied to bytes.
     """
 
-    return Response(content=bytes(payload), media_type=media_type)
+    if type(payload) is bytes:
+        content = payload
+    elif isinstance(payload, _BytesStream):
+        # getbuffer() would copy the shared download; getvalue() returns it
+        content = payload.getvalue()
+    elif isinstance(payload, io.BytesIO):
+        content = payload.getbuffer()
+    else:
+        content = bytes(payload)
+    return binary_response_class(media_type)(content)
 
 
-__all__ = ["fetch_s3_bytes", "run_blocking", "render_bytes"]
+__all__ = ["fetch_s3_bytes", "fetch_s3_stream", "run_blocking", "render_bytes"]
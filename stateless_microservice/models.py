@@ -1,11 +1,13 @@
 """Lightweight models shared by stateless APIs."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class HealthResponse(BaseModel):
     """Health check response."""
 
+    model_config = ConfigDict(frozen=True)
+
     status: str = Field(default="healthy")
     version: str = Field(default="1.0.0")
 
@@ -13,5 +15,13 @@ class HealthResponse(BaseModel):
 class ErrorResponse(BaseModel):
     """Error response envelope."""
 
+    model_config = ConfigDict(frozen=True)
+
     error: str = Field(..., description="High-level error message")
     detail: str | None = Field(None, description="Additional context for debugging")
+
+
+__all__ = ["HealthResponse", "ErrorResponse", "SHARED_MODELS"]
+
+# Schema names every service emits; the OpenAPI aggregator lets these repeat.
+SHARED_MODELS: frozenset[str] = frozenset({"HealthResponse", "ErrorResponse"})
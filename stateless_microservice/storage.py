@@ -1,17 +1,100 @@
 """S3 storage client for handling multipart uploads and object management."""
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
-from typing import List, Dict, Optional, Any
+from typing import Callable, Iterator, List, Dict, Optional, Any
+import functools
+import hashlib
+import hmac
+import itertools
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
 
+# Managed transfers: objects below the threshold go as a single request,
+# larger ones are split into 16 MiB parts moved up to 32 at a time
+_MULTIPART_THRESHOLD = 64 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=_MULTIPART_THRESHOLD,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=32,
+    use_threads=True,
+)
+
+# (endpoint, bucket) pairs already verified or created by an S3Client
+_CHECKED_BUCKETS: set[tuple[str, str]] = set()
+
+# Upper bound on object_exists entries; the cache is reset when it fills up
+_EXISTS_CACHE_MAX_ENTRIES = 4096
+
+
+@functools.lru_cache(maxsize=8)
+def _sigv4_signing_key(secret_key: str, date_stamp: str, region: str, service: str) -> bytes:
+    """Derive the SigV4 signing key; it only changes once a day per region."""
+    key = ("AWS4" + secret_key).encode("utf-8")
+    for part in (date_stamp, region, service, "aws4_request"):
+        key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+    return key
+
+
+def _part_url_signer(first_url: str, secret_key: str) -> Optional[Callable[[int], str]]:
+    """
+    Build a signer for further part URLs from botocore's presigned part-1 URL.
+
+    Part URLs differ only in partNumber, so the scope and signing key are
+    reused, the canonical request up to partNumber is hashed once, and each
+    part only finishes that hash over its short tail before the final HMAC.
+    Returns None if re-signing part 1 does not reproduce botocore's URL
+    (unexpected addressing or credentials), so callers can fall back.
+    """
+    url = urlsplit(first_url)
+    pairs = [pair.partition("=")[::2] for pair in url.query.split("&")]
+    fields = dict(pairs)
+    if "X-Amz-Signature" not in fields or "partNumber" not in fields:
+        return None
+    try:
+        amz_date = fields["X-Amz-Date"]
+        scope = fields["X-Amz-Credential"].split("%2F", 1)[1].replace("%2F", "/")
+        date_stamp, region, service, _ = scope.split("/")
+    except (KeyError, IndexError, ValueError):
+        return None
+
+    signing_key = _sigv4_signing_key(secret_key, date_stamp, region, service)
+    string_to_sign_head = f"AWS4-HMAC-SHA256\n{amz_date}\n{scope}\n"
+
+    def split_at_part_number(items: list) -> tuple[str, str]:
+        # Query text before and after "partNumber=<n>", separators included
+        index = next(i for i, (k, _) in enumerate(items) if k == "partNumber")
+        head = "&".join(f"{k}={v}" for k, v in items[:index])
+        tail = "&".join(f"{k}={v}" for k, v in items[index + 1:])
+        return (head + "&" if head else ""), ("&" + tail if tail else "")
+
+    unsigned = [(k, v) for k, v in pairs if k != "X-Amz-Signature"]
+    canonical_head, canonical_tail = split_at_part_number(sorted(unsigned))
+    canonical_prefix = hashlib.sha256(f"PUT\n{url.path}\n{canonical_head}".encode("utf-8"))
+    canonical_suffix = f"{canonical_tail}\nhost:{url.netloc}\n\nhost\nUNSIGNED-PAYLOAD"
+    url_head, url_tail = split_at_part_number(unsigned)
+    url_head = f"{url.scheme}://{url.netloc}{url.path}?{url_head}"
+
+    def sign(part_number: int) -> str:
+        canonical_hash = canonical_prefix.copy()
+        canonical_hash.update(f"partNumber={part_number}{canonical_suffix}".encode("utf-8"))
+        string_to_sign = string_to_sign_head + canonical_hash.hexdigest()
+        signature = hmac.new(signing_key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        return f"{url_head}partNumber={part_number}{url_tail}&X-Amz-Signature={signature}"
+
+    return sign if sign(1) == first_url else None
+
+
 class S3Client:
     """S3 client wrapper for local S3-compatible storage (MinIO, etc.)."""
 
@@ -26,10 +109,15 @@ class S3Client:
             use_ssl=settings.s3_use_ssl,
         )
         self.bucket = settings.s3_bucket
+        # key -> (expires_at, exists); see object_exists
+        self._exists_cache: Dict[str, tuple[float, bool]] = {}
         self._ensure_bucket_exists()
 
     def _ensure_bucket_exists(self):
-        """Create bucket if it doesn't exist."""
+        """Create bucket if it doesn't exist (checked once per endpoint and bucket)."""
+        checked = (settings.s3_endpoint_url, self.bucket)
+        if checked in _CHECKED_BUCKETS:
+            return
         try:
             self.client.head_bucket(Bucket=self.bucket)
             logger.info(f"Bucket '{self.bucket}' exists")
@@ -40,6 +128,7 @@ class S3Client:
                 self.client.create_bucket(Bucket=self.bucket)
             else:
                 raise
+        _CHECKED_BUCKETS.add(checked)
 
     def create_multipart_upload(self, key: str) -> str:
         """
@@ -85,9 +174,8 @@ class S3Client:
         if ttl_seconds is None:
             ttl_seconds = settings.multipart_url_ttl_seconds
 
-        urls = []
-        for part_number in range(1, num_parts + 1):
-            url = self.client.generate_presigned_url(
+        def presign(part_number: int) -> str:
+            return self.client.generate_presigned_url(
                 'upload_part',
                 Params={
                     'Bucket': self.bucket,
@@ -97,10 +185,19 @@ class S3Client:
                 },
                 ExpiresIn=ttl_seconds,
             )
-            urls.append({
-                'part_number': part_number,
-                'url': url,
-            })
+
+        if num_parts < 1:
+            return []
+
+        # botocore presigns part 1; the rest reuse its canonical request and key
+        first_url = presign(1)
+        sign = _part_url_signer(first_url, settings.s3_secret_key) or presign
+
+        urls = [{'part_number': 1, 'url': first_url}]
+        urls.extend(
+            {'part_number': part_number, 'url': sign(part_number)}
+            for part_number in range(2, num_parts + 1)
+        )
 
         logger.info(f"Generated {num_parts} pre-signed URLs for {key}")
         return urls
@@ -130,6 +227,7 @@ class S3Client:
                 MultipartUpload={'Parts': parts},
             )
             logger.info(f"Completed multipart upload for {key}")
+            self._remember_exists(key, True)
             return response['ETag']
         except ClientError as e:
             logger.error(f"Failed to complete multipart upload for {key}: {e}")
@@ -150,26 +248,43 @@ class S3Client:
                 UploadId=upload_id,
             )
             logger.info(f"Aborted multipart upload for {key}")
+            self._exists_cache.pop(key, None)
         except ClientError as e:
             logger.warning(f"Failed to abort multipart upload for {key}: {e}")
 
+    def _remember_exists(self, key: str, exists: bool):
+        """Record an existence result for object_exists to reuse until it expires."""
+        if len(self._exists_cache) >= _EXISTS_CACHE_MAX_ENTRIES:
+            self._exists_cache.clear()
+        self._exists_cache[key] = (time.monotonic() + settings.object_exists_ttl_seconds, exists)
+
     def object_exists(self, key: str) -> bool:
         """
         Check if an object exists in S3.
 
+        Results are reused for settings.object_exists_ttl_seconds, so polling
+        the same key does not issue a HEAD request every time. Uploads made
+        through this client update the cached result immediately.
+
         Args:
             key: S3 object key
 
         Returns:
             True if object exists, False otherwise
         """
+        entry = self._exists_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
         try:
             self.client.head_object(Bucket=self.bucket, Key=key)
-            return True
+            exists = True
         except ClientError as e:
-            if e.response['Error']['Code'] == '404':
-                return False
-            raise
+            if e.response['Error']['Code'] != '404':
+                raise
+            exists = False
+        self._remember_exists(key, exists)
+        return exists
 
     def get_object_url(self, key: str) -> str:
         """
@@ -183,36 +298,97 @@ class S3Client:
         """
         return f"s3://{self.bucket}/{key}"
 
-    def upload_fileobj(self, fileobj, key: str):
+    def upload_fileobj(self, fileobj, key: str, size_hint: Optional[int] = None):
         """
         Upload a file object directly (for small files).
 
         Args:
             fileobj: File-like object
             key: S3 object key
+            size_hint: Object size in bytes, if known; small objects then skip
+                the transfer manager and go as a single PUT
         """
         try:
-            self.client.upload_fileobj(fileobj, self.bucket, key)
+            if size_hint is not None and size_hint < _MULTIPART_THRESHOLD:
+                self.client.put_object(Bucket=self.bucket, Key=key, Body=fileobj)
+            else:
+                self.client.upload_fileobj(fileobj, self.bucket, key, Config=_TRANSFER_CONFIG)
             logger.info(f"Uploaded object to {key}")
+            self._remember_exists(key, True)
         except ClientError as e:
             logger.error(f"Failed to upload object to {key}: {e}")
             raise
 
-    def download_fileobj(self, key: str, fileobj):
+    def download_fileobj(self, key: str, fileobj, size_hint: Optional[int] = None):
         """
         Download an object to a file object.
 
         Args:
             key: S3 object key
             fileobj: File-like object to write to
+            size_hint: Object size in bytes, if known; small objects then skip
+                the transfer manager and are read with a single GET
         """
         try:
-            self.client.download_fileobj(self.bucket, key, fileobj)
+            if size_hint is not None and size_hint < _MULTIPART_THRESHOLD:
+                fileobj.write(self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read())
+            else:
+                self.client.download_fileobj(self.bucket, key, fileobj, Config=_TRANSFER_CONFIG)
             logger.info(f"Downloaded object from {key}")
         except ClientError as e:
             logger.error(f"Failed to download object from {key}: {e}")
             raise
 
+    def get_object_bytes(self, key: str) -> bytes:
+        """
+        Read an object's full contents with a single GET.
+
+        Cheaper than download_fileobj for in-memory reads: no transfer
+        manager threads and no intermediate file object.
+
+        Args:
+            key: S3 object key
+
+        Returns:
+            Object bytes
+        """
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            data = response['Body'].read()
+            logger.info(f"Read object from {key}")
+            return data
+        except ClientError as e:
+            logger.error(f"Failed to read object from {key}: {e}")
+            raise
+
+    def iter_objects(self, prefix: str, page_size: int = 1000) -> Iterator[str]:
+        """
+        Lazily yield object keys with a given prefix, following continuation tokens.
+
+        Pages are fetched on demand, so callers that stop early never request
+        the remaining pages.
+
+        Args:
+            prefix: S3 key prefix
+            page_size: Keys requested per list_objects_v2 call
+
+        Yields:
+            Object keys
+        """
+        paginator = self.client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket,
+            Prefix=prefix,
+            PaginationConfig={'PageSize': page_size},
+        )
+        try:
+            for page in pages:
+                for obj in page.get('Contents', ()):
+                    yield obj['Key']
+        except ClientError as e:
+            logger.error(f"Failed to list objects with prefix {prefix}: {e}")
+            raise
+
     def list_objects(self, prefix: str, max_keys: int = 1000) -> List[str]:
         """
         List objects with a given prefix.
@@ -224,26 +400,19 @@ class S3Client:
         Returns:
             List of object keys
         """
-        try:
-            response = self.client.list_objects_v2(
-                Bucket=self.bucket,
-                Prefix=prefix,
-                MaxKeys=max_keys,
-            )
-            if 'Contents' not in response:
-                return []
-            return [obj['Key'] for obj in response['Contents']]
-        except ClientError as e:
-            logger.error(f"Failed to list objects with prefix {prefix}: {e}")
-            raise
+        keys = self.iter_objects(prefix, page_size=min(max_keys, 1000))
+        return list(itertools.islice(keys, max_keys))
 
 
 _s3_client: Optional["S3Client"] = None
+_s3_client_lock = threading.Lock()
 
 
 def get_s3_client() -> "S3Client":
-    """Return a lazily constructed singleton S3 client."""
+    """Return a lazily constructed singleton S3 client (safe to call from worker threads)."""
     global _s3_client
     if _s3_client is None:
-        _s3_client = S3Client()
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = S3Client()
     return _s3_client
@@ -0,0 +1,109 @@
+"""Shared fixtures for the stateless microservice test suite."""
+
+import contextlib
+import functools
+from enum import Enum
+from typing import List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from stateless_microservice import BaseProcessor, StatelessAction, create_app
+
+
+class Action(str, Enum):
+    """Actions accepted by the path params test."""
+    START = "start"
+    STOP = "stop"
+
+
+class PathParams(BaseModel):
+    """Test path parameters with Enum type."""
+    action: Action
+
+
+class RequestPayload(BaseModel):
+    """Test request payload."""
+    value: int
+
+
+class TestProcessor(BaseProcessor):
+    """Test processor for validation error handling."""
+
+    @property
+    def name(self) -> str:
+        return "test-validation"
+
+    def get_stateless_actions(self) -> List[StatelessAction]:
+        return [
+            StatelessAction(
+                name="test_path_params",
+                path="/test/{action}",
+                path_params_model=PathParams,
+                handler=self.handle_path_params,
+                methods=("GET",),
+            ),
+            StatelessAction(
+                name="test_request_body",
+                path="/test/body",
+                request_model=RequestPayload,
+                handler=self.handle_request_body,
+                methods=("POST",),
+            ),
+        ]
+
+    def handle_path_params(self, path_params: PathParams):
+        """Handler for path params test."""
+        return {"action": path_params.action.value}
+
+    def handle_request_body(self, payload: RequestPayload):
+        """Handler for request body test."""
+        # payload was already validated by FastAPI; return a plain dict rather
+        # than re-validating it into another model
+        return {"value": payload.value}
+
+
+@functools.lru_cache(maxsize=None)
+def _app_for(processor_cls: type[BaseProcessor]) -> FastAPI:
+    """Build the app for a stateless processor class once per test run."""
+    return create_app(processor_cls())
+
+
+@pytest.fixture(scope="session")
+def app_for():
+    """Build (once per run) the app for a stateless processor class."""
+    return _app_for
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run anyio tests and session fixtures on asyncio."""
+    return "asyncio"
+
+
+@contextlib.asynccontextmanager
+async def _serve(app: FastAPI):
+    """Run the app's lifespan and yield an in-process client for it.
+
+    httpx.ASGITransport never sends lifespan events, so startup/shutdown (e.g.
+    a ServiceConfig.lifespan) is driven here instead.
+    """
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            yield client
+
+
+@pytest.fixture(scope="session")
+def serve():
+    """Open an in-process client for an app, with its lifespan running."""
+    return _serve
+
+
+@pytest.fixture(scope="session")
+async def validation_client():
+    """Client calling the TestProcessor app in-process, shared by the whole test run."""
+    async with _serve(_app_for(TestProcessor)) as client:
+        yield client
@@ -0,0 +1,326 @@
+"""Tests for merging OpenAPI specs in the aggregation gateway."""
+
+import asyncio
+import functools
+import subprocess
+import sys
+
+import httpx
+import orjson
+import pytest
+
+from stateless_microservice import aggregate_openapi
+from stateless_microservice.aggregate_openapi import aggregate_specs, create_gateway_app
+
+
+def _spec(title: str, paths: dict, schemas: dict) -> dict:
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": title},
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
+
+
+SPECS = {
+    "http://host/alpha": _spec(
+        "Alpha",
+        {"/run": {"post": {}}},
+        {"HealthResponse": {"type": "object"}, "AlphaRequest": {"type": "object"}},
+    ),
+    "http://host/beta": _spec(
+        "Beta",
+        {"/run": {"get": {}}},
+        {"HealthResponse": {"type": "object"}, "BetaRequest": {"type": "object"}},
+    ),
+    "http://host/gamma/": _spec(
+        "Gamma",
+        {"/status": {"get": {}}},
+        {"GammaResponse": {"type": "object"}},
+    ),
+}
+
+
+def _serve(monkeypatch, specs: dict) -> None:
+    """Serve specs from a dict instead of the network."""
+
+    async def fetch(client, url):
+        return specs[url]
+
+    monkeypatch.setattr(aggregate_openapi, "fetch_openapi_spec", fetch)
+    monkeypatch.setattr(aggregate_openapi, "_SPEC_CACHE", {})
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch):
+    """Serve specs from SPECS instead of the network."""
+    _serve(monkeypatch, SPECS)
+
+
+def test_paths_are_prefixed_with_service_name(fake_fetch):
+    """Test that every path is namespaced under its service."""
+    aggregated = asyncio.run(aggregate_specs(list(SPECS)))
+
+    assert set(aggregated["paths"]) == {"/alpha/run", "/beta/run", "/gamma/status"}
+
+
+def test_shared_models_are_merged_once(fake_fetch):
+    """Test that models shared via stateless_microservice do not conflict."""
+    aggregated = asyncio.run(aggregate_specs(list(SPECS)))
+
+    assert set(aggregated["components"]["schemas"]) == {
+        "HealthResponse",
+        "AlphaRequest",
+        "BetaRequest",
+        "GammaResponse",
+    }
+
+
+def test_conflicting_schema_names_raise(monkeypatch):
+    """Test that a schema defined by two services is rejected."""
+    specs = {
+        "http://host/one": _spec("One", {}, {"Payload": {"type": "object"}}),
+        "http://host/two": _spec("Two", {}, {"Payload": {"type": "string"}}),
+    }
+    _serve(monkeypatch, specs)
+
+    with pytest.raises(RuntimeError, match="naming conflict: 'Payload'"):
+        asyncio.run(aggregate_specs(list(specs)))
+
+
+def test_cached_spec_round_trips(tmp_path):
+    """Test that a written spec is reused for the same service list."""
+    cache_file = tmp_path / "openapi.json"
+    spec = _spec("Cached", {"/alpha/run": {"post": {}}}, {})
+    aggregate_openapi.write_cached_spec(cache_file, ["http://host/alpha"], spec)
+
+    assert aggregate_openapi.load_cached_spec(cache_file, ["http://host/alpha"], 60) == spec
+
+
+def test_cached_spec_ignored_when_stale_or_for_other_services(tmp_path):
+    """Test that the cache is bypassed when expired or built from other URLs."""
+    cache_file = tmp_path / "openapi.json"
+    aggregate_openapi.write_cached_spec(cache_file, ["http://host/alpha"], _spec("Cached", {}, {}))
+
+    assert aggregate_openapi.load_cached_spec(cache_file, ["http://host/beta"], 60) is None
+    assert aggregate_openapi.load_cached_spec(cache_file, ["http://host/alpha"], 0) is None
+    assert aggregate_openapi.load_cached_spec(tmp_path / "missing.json", ["http://host/alpha"], 60) is None
+
+
+@pytest.mark.parametrize("content", [b"[1, 2]", b'"spec"', b'{"urls": ["http://host/alpha"], "spec": []}', b"not json"])
+def test_cached_spec_ignored_when_malformed(tmp_path, content):
+    """Test that a cache file of the wrong shape is treated as a miss."""
+    cache_file = tmp_path / "openapi.json"
+    cache_file.write_bytes(content)
+
+    assert aggregate_openapi.load_cached_spec(cache_file, ["http://host/alpha"], 60) is None
+
+
+def test_fetch_reuses_spec_on_not_modified(monkeypatch):
+    """Test that a known ETag is sent and a 304 reuses the stored spec."""
+    monkeypatch.setattr(aggregate_openapi, "_VALIDATORS", {})
+    spec = _spec("Alpha", {"/run": {"post": {}}}, {})
+    seen = []
+
+    def respond(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=spec, headers={"ETag": '"v1"'})
+
+    async def fetch_twice():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(respond)) as client:
+            first = await aggregate_openapi.fetch_openapi_spec(client, "http://host/alpha")
+            second = await aggregate_openapi.fetch_openapi_spec(client, "http://host/alpha")
+        return first, second
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert first == second == spec
+    assert seen == [None, '"v1"']
+
+
+def test_load_validators_ignores_malformed_entries(monkeypatch, tmp_path):
+    """Test that a sidecar of the wrong shape is skipped instead of raising."""
+    monkeypatch.setattr(aggregate_openapi, "_VALIDATORS", {})
+    good = {"etag": '"v1"', "last_modified": None, "spec": _spec("Alpha", {}, {})}
+    path = tmp_path / "openapi.json.etags"
+
+    for content in (b"[1, 2]", b'"etags"', b"not json"):
+        path.write_bytes(content)
+        aggregate_openapi.load_validators(path)
+    path.write_bytes(orjson.dumps({
+        "http://host/alpha": good,
+        "http://host/beta": [],
+        "http://host/gamma": {"etag": 1, "spec": {}},
+        "http://host/delta": {"etag": '"v2"'},
+    }))
+    aggregate_openapi.load_validators(path)
+
+    assert aggregate_openapi._VALIDATORS == {"http://host/alpha": good}
+
+
+def test_fetch_follows_redirects(monkeypatch):
+    """Test that a service redirecting its spec URL is still aggregated."""
+    monkeypatch.setattr(aggregate_openapi, "_SPEC_CACHE", {})
+    monkeypatch.setattr(aggregate_openapi, "_VALIDATORS", {})
+    spec = _spec("Alpha", {"/run": {"post": {}}}, {})
+
+    def respond(request):
+        if request.url.scheme == "http":
+            return httpx.Response(301, headers={"Location": str(request.url.copy_with(scheme="https"))})
+        return httpx.Response(200, json=spec)
+
+    client_class = functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(respond))
+    monkeypatch.setattr(aggregate_openapi.httpx, "AsyncClient", client_class)
+
+    aggregated = asyncio.run(aggregate_specs(["http://host/alpha"]))
+
+    assert set(aggregated["paths"]) == {"/alpha/run"}
+
+
+def test_import_skips_service_and_cli_dependencies():
+    """Test that importing the module does not load FastAPI, argparse or apache_conf."""
+    probe = (
+        "import sys, stateless_microservice.aggregate_openapi; "
+        "print(sorted(m for m in ('argparse', 'fastapi', 'stateless_microservice.apache_conf') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def _gateway(spec: dict, requests: list[dict]) -> list[httpx.Response]:
+    """Send GET /openapi.json to a gateway app once per set of request headers."""
+
+    async def send():
+        transport = httpx.ASGITransport(app=create_gateway_app(spec, cache_max_age=60))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return [await client.get("/openapi.json", headers=headers) for headers in requests]
+
+    return asyncio.run(send())
+
+
+GATEWAY_SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Aggregated", "version": "1.0.0", "description": "Test gateway"},
+    "paths": {f"/svc/path{i}": {"get": {}} for i in range(100)},
+    "components": {},
+}
+
+
+def test_gateway_serves_identity_and_gzip_spec():
+    """Test that /openapi.json is served plain or pre-compressed per Accept-Encoding."""
+    identity, compressed = _gateway(
+        GATEWAY_SPEC, [{"Accept-Encoding": "identity"}, {"Accept-Encoding": "gzip"}]
+    )
+
+    assert identity.status_code == 200
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == GATEWAY_SPEC
+    assert identity.headers["cache-control"] == "public, max-age=60"
+    assert identity.headers["vary"] == "Accept-Encoding"
+
+    assert compressed.status_code == 200
+    assert compressed.headers["content-encoding"] == "gzip"
+    # httpx decodes transparently; the body must be the same spec
+    assert compressed.json() == GATEWAY_SPEC
+    assert compressed.headers["vary"] == "Accept-Encoding"
+
+    # Below the middleware's threshold the identity body carries its own Vary
+    small_spec = {**GATEWAY_SPEC, "paths": {}}
+    (small,) = _gateway(small_spec, [{"Accept-Encoding": "identity"}])
+    assert small.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, compressed",
+    [
+        ("gzip", True),
+        ("deflate, gzip;q=0.5", True),
+        ("*", True),
+        ("GZIP; Q=1.0", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0, *", False),
+        ("*;q=0", False),
+        ("identity", False),
+        ("br, deflate", False),
+        ("", False),
+    ],
+)
+def test_gateway_honours_accept_encoding_q_values(accept_encoding, compressed):
+    """Test that gzip is only sent when the client's Accept-Encoding allows it."""
+    (response,) = _gateway(GATEWAY_SPEC, [{"Accept-Encoding": accept_encoding}])
+
+    assert response.status_code == 200
+    assert ("content-encoding" in response.headers) is compressed
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == GATEWAY_SPEC
+
+
+def test_gateway_etag_differs_per_encoding_and_revalidates():
+    """Test one ETag per encoding and a 304 for a matching If-None-Match."""
+    identity, compressed = _gateway(
+        GATEWAY_SPEC, [{"Accept-Encoding": "identity"}, {"Accept-Encoding": "gzip"}]
+    )
+    identity_etag, gzip_etag = identity.headers["etag"], compressed.headers["etag"]
+    assert identity_etag != gzip_etag
+
+    fresh, stale, cross = _gateway(
+        GATEWAY_SPEC,
+        [
+            {"Accept-Encoding": "gzip", "If-None-Match": gzip_etag},
+            {"Accept-Encoding": "gzip", "If-None-Match": '"outdated"'},
+            {"Accept-Encoding": "identity", "If-None-Match": gzip_etag},
+        ],
+    )
+
+    assert fresh.status_code == 304
+    assert fresh.content == b""
+    assert fresh.headers["etag"] == gzip_etag
+    assert fresh.headers["vary"] == "Accept-Encoding"
+    assert stale.status_code == 200
+    assert cross.status_code == 200
+    assert cross.headers["etag"] == identity_etag
+
+
+@pytest.mark.parametrize(
+    "if_none_match, status",
+    [
+        ("*", 304),
+        ('"outdated", {etag}', 304),
+        ("W/{etag}", 304),
+        ('"{digest}"', 200),
+        ('"{digest}-gzip-extra"', 200),
+        ('x{etag}x', 200),
+    ],
+)
+def test_gateway_if_none_match_compares_each_etag(if_none_match, status):
+    """Test that If-None-Match is split into ETags that are compared exactly."""
+    (first,) = _gateway(GATEWAY_SPEC, [{"Accept-Encoding": "gzip"}])
+    etag = first.headers["etag"]
+    digest = etag.strip('"').removesuffix("-gzip")
+
+    (response,) = _gateway(
+        GATEWAY_SPEC,
+        [{"Accept-Encoding": "gzip", "If-None-Match": if_none_match.format(etag=etag, digest=digest)}],
+    )
+
+    assert response.status_code == status
+
+
+def test_gateway_serves_swagger_oauth2_redirect():
+    """Test that the Swagger UI OAuth2 redirect page is served next to /docs."""
+
+    async def send():
+        transport = httpx.ASGITransport(app=create_gateway_app(GATEWAY_SPEC, root_path="/api-docs"))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.get("/docs"), await client.get("/docs/oauth2-redirect")
+
+    docs, redirect = asyncio.run(send())
+
+    assert docs.status_code == 200
+    assert "/api-docs/docs/oauth2-redirect" in docs.text
+    assert redirect.status_code == 200
+    assert "oauth2" in redirect.text.lower()
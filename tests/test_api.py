@@ -0,0 +1,169 @@
+"""Tests for endpoint dispatch in the stateless app factory."""
+
+import contextlib
+import math
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from stateless_microservice import BaseProcessor, ServiceConfig, StatelessAction, create_app
+
+pytestmark = pytest.mark.anyio
+
+
+class IntPayload(BaseModel):
+    """Payload with an int field."""
+    value: int
+
+
+class FloatPayload(BaseModel):
+    """Payload with a float field for non-finite JSON literals."""
+    value: float
+
+
+class DispatchProcessor(BaseProcessor):
+    """Processor exercising the handler shapes create_app dispatches on."""
+
+    @property
+    def name(self) -> str:
+        return "test-dispatch"
+
+    def get_stateless_actions(self) -> List[StatelessAction]:
+        return [
+            # Not a coroutine function, but returns an awaitable
+            StatelessAction(
+                name="lambda_awaitable",
+                path="/awaitable",
+                request_model=IntPayload,
+                handler=lambda payload: self.double(payload),
+            ),
+            StatelessAction(
+                name="echo_int",
+                path="/int",
+                request_model=IntPayload,
+                handler=self.echo_int,
+            ),
+            StatelessAction(
+                name="float_is_finite",
+                path="/float",
+                request_model=FloatPayload,
+                handler=self.float_is_finite,
+            ),
+            StatelessAction(
+                name="annotated_bytes",
+                path="/bytes/annotated",
+                handler=self.annotated_bytes,
+                methods=("GET",),
+                media_type="image/png",
+            ),
+            StatelessAction(
+                name="unannotated_bytes",
+                path="/bytes/unannotated",
+                handler=self.unannotated_bytes,
+                methods=("GET",),
+                media_type="image/png",
+            ),
+            StatelessAction(
+                name="media_type_dict",
+                path="/bytes/dict",
+                handler=self.media_type_dict,
+                methods=("GET",),
+                media_type="image/png",
+            ),
+        ]
+
+    async def double(self, payload: IntPayload):
+        return {"value": payload.value * 2}
+
+    def echo_int(self, payload: IntPayload):
+        return {"value": payload.value}
+
+    def float_is_finite(self, payload: FloatPayload):
+        return {"finite": math.isfinite(payload.value)}
+
+    async def annotated_bytes(self) -> bytes:
+        return b"\x89PNG annotated"
+
+    def unannotated_bytes(self):
+        return bytearray(b"\x89PNG unannotated")
+
+    def media_type_dict(self):
+        return {"ok": True}
+
+
+@pytest.fixture(scope="module")
+async def dispatch_client(serve, app_for):
+    async with serve(app_for(DispatchProcessor)) as client:
+        yield client
+
+
+async def test_service_lifespan_runs_around_requests(serve):
+    """Test that a ServiceConfig lifespan has started before requests and stops after."""
+    events = []
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        events.append("startup")
+        yield
+        events.append("shutdown")
+
+    app = create_app(DispatchProcessor(), ServiceConfig(lifespan=lifespan))
+    async with serve(app) as client:
+        await client.get("/health")
+        assert events == ["startup"]
+
+    assert events == ["startup", "shutdown"]
+
+
+async def test_awaitable_from_non_coroutine_handler_is_awaited(dispatch_client):
+    """Test that a lambda returning a coroutine is still awaited."""
+    response = await dispatch_client.post("/awaitable", json={"value": 21})
+
+    assert response.status_code == 200
+    assert response.json() == {"value": 42}
+
+
+@pytest.mark.parametrize(
+    "url, body",
+    [
+        ("/bytes/annotated", b"\x89PNG annotated"),
+        ("/bytes/unannotated", b"\x89PNG unannotated"),
+    ],
+)
+async def test_bytes_results_use_action_media_type(dispatch_client, url, body):
+    """Test that bytes-like results are sent raw with the action's media type."""
+    response = await dispatch_client.get(url)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == body
+
+
+async def test_non_bytes_result_with_media_type_is_serialized(dispatch_client):
+    """Test that non-bytes results from a media_type action fall through to JSON."""
+    response = await dispatch_client.get("/bytes/dict")
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+
+
+async def test_integers_wider_than_64_bits_stay_exact(dispatch_client):
+    """Test that large integer bodies are not rounded through a float."""
+    response = await dispatch_client.post(
+        "/int", content=b'{"value": 18446744073709551617}', headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 200
+    assert b"18446744073709551617" in response.content
+
+
+@pytest.mark.parametrize("literal", [b"NaN", b"Infinity", b"-Infinity"])
+async def test_non_finite_literals_are_accepted(dispatch_client, literal):
+    """Test that the NaN/Infinity literals accepted by json.loads still parse."""
+    response = await dispatch_client.post(
+        "/float", content=b'{"value": ' + literal + b"}", headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"finite": False}
@@ -0,0 +1,52 @@
+"""Tests for the direct S3/response helpers that need no live endpoint."""
+
+import asyncio
+import io
+import tracemalloc
+
+import pytest
+
+from stateless_microservice import direct
+from stateless_microservice.config import settings
+from stateless_microservice.direct import fetch_s3_stream, render_bytes
+
+PAYLOAD_SIZE = 8 * 1024 * 1024
+
+
+def _peak_allocated(func):
+    """Return func's result and the peak bytes traced while it ran."""
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture
+def s3_object(monkeypatch):
+    """Serve one object from memory in place of get_object_bytes."""
+    data = bytes(PAYLOAD_SIZE)
+    monkeypatch.setattr(direct, "_read_object", lambda key: data)
+    return data
+
+
+def test_fetch_s3_stream_round_trip_does_not_copy(s3_object):
+    """Test that rendering a fetched stream sends the downloaded bytes as-is."""
+    stream = asyncio.run(fetch_s3_stream(f"s3://{settings.s3_bucket}/image.png"))
+
+    response, peak = _peak_allocated(lambda: render_bytes(stream, "image/png"))
+
+    assert response.body is s3_object
+    assert peak < PAYLOAD_SIZE // 8
+
+
+def test_render_bytes_sends_written_buffer_without_copy():
+    """Test that a BytesIO the caller wrote into is sent from its own memory."""
+    buffer = io.BytesIO()
+    buffer.write(bytes(PAYLOAD_SIZE))
+
+    response, peak = _peak_allocated(lambda: render_bytes(buffer, "image/png"))
+
+    assert response.body == bytes(PAYLOAD_SIZE)
+    assert peak < PAYLOAD_SIZE // 8
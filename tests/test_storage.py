@@ -0,0 +1,115 @@
+"""Tests for the S3 storage client helpers that need no live endpoint."""
+
+import datetime
+import io
+
+import boto3
+import botocore.auth
+import pytest
+from botocore.client import Config
+from botocore.stub import Stubber
+
+from stateless_microservice import storage
+from stateless_microservice.config import settings
+from stateless_microservice.storage import S3Client, _part_url_signer
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    """S3Client wired to an unreachable endpoint, with the clock frozen for signing."""
+    fixed = datetime.datetime(2024, 5, 1, 12, 0, 0)
+    monkeypatch.setattr(botocore.auth, "get_current_datetime", lambda: fixed)
+
+    client = S3Client.__new__(S3Client)
+    client.client = boto3.client(
+        "s3",
+        endpoint_url="http://localhost:9000",
+        aws_access_key_id=settings.s3_access_key,
+        aws_secret_access_key=settings.s3_secret_key,
+        config=Config(signature_version="s3v4"),
+        region_name="us-east-1",
+    )
+    client.bucket = settings.s3_bucket
+    client._exists_cache = {}
+    return client
+
+
+@pytest.mark.parametrize("key", ["bins/D20240501T120000_IFCB1.roi", "path with spaces/ü+file"])
+def test_presigned_part_urls_match_botocore(s3_client, key):
+    """Test that re-signed part URLs are identical to botocore's own."""
+    urls = s3_client.generate_presigned_part_urls(key, "upload-123", num_parts=5, ttl_seconds=600)
+
+    assert [entry["part_number"] for entry in urls] == [1, 2, 3, 4, 5]
+    # The re-signing fast path (not the per-part botocore fallback) was usable
+    assert _part_url_signer(urls[0]["url"], settings.s3_secret_key) is not None
+    for entry in urls:
+        expected = s3_client.client.generate_presigned_url(
+            "upload_part",
+            Params={
+                "Bucket": s3_client.bucket,
+                "Key": key,
+                "UploadId": "upload-123",
+                "PartNumber": entry["part_number"],
+            },
+            ExpiresIn=600,
+        )
+        assert entry["url"] == expected
+
+
+def test_presigned_part_urls_empty(s3_client):
+    """Test that zero parts yields no URLs."""
+    assert s3_client.generate_presigned_part_urls("key", "upload-123", num_parts=0) == []
+
+
+def test_object_exists_reuses_recent_head_result(s3_client):
+    """Test that repeated existence checks within the TTL issue one HEAD."""
+    with Stubber(s3_client.client) as stubber:
+        stubber.add_response("head_object", {}, {"Bucket": s3_client.bucket, "Key": "present"})
+        stubber.add_client_error("head_object", service_error_code="404", http_status_code=404)
+
+        assert s3_client.object_exists("present") is True
+        assert s3_client.object_exists("present") is True
+        assert s3_client.object_exists("missing") is False
+        assert s3_client.object_exists("missing") is False
+        stubber.assert_no_pending_responses()
+
+
+def test_list_objects_follows_pages_and_stops_at_max_keys(s3_client):
+    """Test that listing spans continuation pages and stops once max_keys is reached."""
+    with Stubber(s3_client.client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            {"Contents": [{"Key": "bins/a"}, {"Key": "bins/b"}], "IsTruncated": True, "NextContinuationToken": "t1"},
+            {"Bucket": s3_client.bucket, "Prefix": "bins/", "MaxKeys": 3},
+        )
+        stubber.add_response(
+            "list_objects_v2",
+            {"Contents": [{"Key": "bins/c"}, {"Key": "bins/d"}], "IsTruncated": True, "NextContinuationToken": "t2"},
+            {"Bucket": s3_client.bucket, "Prefix": "bins/", "MaxKeys": 3, "ContinuationToken": "t1"},
+        )
+
+        assert s3_client.list_objects("bins/", max_keys=3) == ["bins/a", "bins/b", "bins/c"]
+        stubber.assert_no_pending_responses()
+
+
+def test_small_upload_with_size_hint_is_a_single_put(s3_client):
+    """Test that a known-small upload bypasses the multipart transfer manager."""
+    body = io.BytesIO(b"roi bytes")
+    with Stubber(s3_client.client) as stubber:
+        stubber.add_response("put_object", {}, {"Bucket": s3_client.bucket, "Key": "small", "Body": body})
+
+        s3_client.upload_fileobj(body, "small", size_hint=9)
+        stubber.assert_no_pending_responses()
+
+    assert s3_client.object_exists("small") is True
+
+
+def test_bucket_is_checked_once_per_process(s3_client, monkeypatch):
+    """Test that later clients skip the HEAD for a bucket already verified."""
+    monkeypatch.setattr(storage, "_CHECKED_BUCKETS", set())
+    with Stubber(s3_client.client) as stubber:
+        stubber.add_response("head_bucket", {}, {"Bucket": s3_client.bucket})
+
+        s3_client._ensure_bucket_exists()
+        s3_client._ensure_bucket_exists()
+        stubber.assert_no_pending_responses()
@@ -1,105 +1,65 @@
 """Tests for validation error handling in stateless microservices."""
 
-from typing import List, Literal
+import asyncio
 
-from fastapi.testclient import TestClient
-from pydantic import BaseModel
+import orjson
+import pytest
 
-from stateless_microservice import BaseProcessor, StatelessAction, create_app
+pytestmark = pytest.mark.anyio
 
 
-class PathParams(BaseModel):
-    """Test path parameters with Literal type."""
-    action: Literal["start", "stop"]
+def _json(response):
+    """Decode a response body with orjson."""
+    return orjson.loads(response.content)
 
 
-class RequestPayload(BaseModel):
-    """Test request payload."""
-    value: int
+def _check_validation_error(response):
+    assert b'"error"' in response.content
+    assert b"Validation error" in response.content
 
 
-class TestProcessor(BaseProcessor):
-    """Test processor for validation error handling."""
+def _check_detail(response):
+    assert b'"detail"' in response.content
 
-    @property
-    def name(self) -> str:
-        return "test-validation"
 
-    def get_stateless_actions(self) -> List[StatelessAction]:
-        return [
-            StatelessAction(
-                name="test_path_params",
-                path="/test/{action}",
-                path_params_model=PathParams,
-                handler=self.handle_path_params,
-                methods=("GET",),
-            ),
-            StatelessAction(
-                name="test_request_body",
-                path="/test/body",
-                request_model=RequestPayload,
-                handler=self.handle_request_body,
-                methods=("POST",),
-            ),
-        ]
+def _check_value(response):
+    assert _json(response)["value"] == 42
 
-    def handle_path_params(self, path_params: PathParams):
-        """Handler for path params test."""
-        return {"action": path_params.action}
 
-    def handle_request_body(self, payload: RequestPayload):
-        """Handler for request body test."""
-        return {"value": payload.value}
+def _check_json_invalid(response):
+    assert _json(response)["detail"][0]["type"] == "json_invalid"
 
 
-def test_path_param_validation_literal_mismatch():
-    """Test that invalid Literal path param returns 400."""
-    processor = TestProcessor()
-    app = create_app(processor)
-    client = TestClient(app)
+# (id, method, url, request kwargs, expected status, body check)
+CASES = [
+    # Invalid Action path param ("start"/"stop" only) returns 400
+    ("path-enum-mismatch", "GET", "/test/invalid", {}, 400, _check_validation_error),
+    # Valid Action path param
+    ("path-enum-valid", "GET", "/test/start", {}, 200, None),
+    # Invalid request body returns 422 (FastAPI default)
+    ("body-invalid", "POST", "/test/body", {"json": {"value": "not_an_int"}}, 422, _check_detail),
+    ("body-valid", "POST", "/test/body", {"json": {"value": 42}}, 200, _check_value),
+    # A body that is not valid JSON returns 422
+    (
+        "body-malformed-json",
+        "POST",
+        "/test/body",
+        {"content": b'{"value": ', "headers": {"Content-Type": "application/json"}},
+        422,
+        _check_json_invalid,
+    ),
+]
 
-    # Send invalid value "invalid" when only "start" or "stop" are allowed
-    response = client.get("/test/invalid")
 
-    assert response.status_code == 400
-    data = response.json()
-    assert "error" in data
-    assert "Validation error" in data["error"]
+async def test_validation(validation_client):
+    """Test the status code and error body for each validation case, sent concurrently."""
+    responses = await asyncio.gather(
+        *(validation_client.request(method, url, **kwargs) for _, method, url, kwargs, _, _ in CASES)
+    )
 
-
-def test_path_param_validation_type_error():
-    """Test that type conversion errors in path params return 400."""
-    processor = TestProcessor()
-    app = create_app(processor)
-    client = TestClient(app)
-
-    # Valid literal value
-    response = client.get("/test/start")
-    assert response.status_code == 200
-
-
-def test_request_body_validation_error():
-    """Test that invalid request body returns 422 (FastAPI default)."""
-    processor = TestProcessor()
-    app = create_app(processor)
-    client = TestClient(app)
-
-    # Send string when int is expected
-    response = client.post("/test/body", json={"value": "not_an_int"})
-
-    assert response.status_code == 422
-    data = response.json()
-    assert "detail" in data
-
-
-def test_request_body_validation_success():
-    """Test that valid request body returns 200."""
-    processor = TestProcessor()
-    app = create_app(processor)
-    client = TestClient(app)
-
-    response = client.post("/test/body", json={"value": 42})
-
-    assert response.status_code == 200
-    data = response.json()
-    assert data["value"] == 42
+    assert [(case[0], r.status_code) for case, r in zip(CASES, responses)] == [
+        (case[0], case[4]) for case in CASES
+    ]
+    for (_, _, _, _, _, check), response in zip(CASES, responses):
+        if check:
+            check(response)